@@ -7,6 +7,9 @@ import matplotlib.pyplot as plt
 
 from h5utils import write_data_and_label, print_hdf5_structure, datadir
 
+# Lookup table mapping uint8 pixel values to normalized float32 values.
+_LUT = np.arange(256, dtype=np.float32) * np.float32(1 / 255.0)
+
 
 def main() -> None:
     """Writing and reading a JPEG file to an HDF5 file.
@@ -29,12 +32,15 @@ def main() -> None:
     # Load a sample image from skimage.
     image = data.astronaut()
 
-    # Cast the image to type np.float32 and normalize to [0, 1].
-    data_array = image.astype(np.float32) / 255.0
-
-    # Add a new axis and permute to match the expected shape in torch:
+    # Allocate a contiguous float32 buffer with the expected shape in torch:
     # (1, channels, height, width).
-    data_array = data_array[np.newaxis, ...].transpose(0, 3, 1, 2)
+    height, width, channels = image.shape
+    data_array = np.empty((1, channels, height, width), dtype=np.float32)
+
+    # Permute the image and normalize it to [0, 1] directly into the buffer by
+    # looking up the uint8 pixel values in the table. uint8 indices are always
+    # in range, and mode='clip' avoids buffering the output as 'raise' does.
+    np.take(_LUT, image.transpose(2, 0, 1), out=data_array[0], mode='clip')
 
     # Example label (e.g., a string)
     label_array = np.array(['astronaut'], dtype='S')
@@ -54,7 +60,7 @@ def main() -> None:
     # Read the image back from the HDF5 file.
     file = h5py.File(file_path, 'r')
     image = file[dataset_name][0]
-    label = file[dataset_name].attrs['label'][0].decode('utf-8')
+    label = file[dataset_name].attrs['label'].decode('utf-8')
     file.close()
 
     # Permute the image back to the original shape so that it can be displayed.
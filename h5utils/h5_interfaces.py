@@ -2,124 +2,798 @@
 """
 
 import os
-from typing import Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Optional, Sequence, Tuple
 
 import h5py
 import numpy as np
 
 from h5utils.project_path import datadir
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 
 def write_data_and_label(
     file_path: str,
     dataset_name: str,
     data_array: np.ndarray,
     label_array: np.ndarray,
+    cache_bytes: int = 64 << 20,
+    cache_slots: int = 100003,
+    backend: Literal['h5', 'zarr'] = 'h5',
+    libver: str = 'latest',
 ) -> None:
     """
     Writes data and label to an HDF5 file.
 
+    If the optional `xxhash` package is installed, the checksum of the data is
+    stored as the `xxh64` attribute of the dataset, and later calls with the
+    same data skip the write. Any other write to the dataset must therefore
+    delete that attribute, as `write_sample`, `H5Writer` and `write_many` do.
+
     Args:
         file_path (str): The path to the HDF5 file.
         dataset_name (str): The name of the dataset in the HDF5 file.
-        data_array (np.ndarray): The data to be written to the dataset.
+        data_array (np.ndarray): The data to be written to the dataset. It is
+            converted to a C-contiguous float32 array first, so passing such
+            an array avoids a copy.
         label_array (np.ndarray): The label to be added as an attribute to the
             dataset.
+        cache_bytes (int, optional): The size of the raw data chunk cache in
+            bytes. Defaults to 64 MB.
+        cache_slots (int, optional): The number of slots in the raw data chunk
+            cache hash table. Should be a prime number roughly 10 times the
+            number of chunks that fit in the cache. Defaults to 100003.
+        backend (Literal['h5', 'zarr'], optional): The storage backend. With
+            'zarr', `file_path` is a Zarr store and `dataset_name` an array in
+            it, which lets multiple processes write independently. Requires
+            the optional `zarr>=3` package. Defaults to 'h5'.
+        libver (str, optional): The HDF5 file format version bounds passed to
+            `h5py.File`. 'latest' enables faster metadata structures, such as
+            version 2 B-trees and dense attribute storage, but objects written
+            this way cannot be read with HDF5 versions older than the one used
+            to write them. Use 'earliest' where such readability matters.
+            Defaults to 'latest'.
 
     Returns:
         None
-    """
 
-    # Check if the HDF5 file exists; if not, create it and set up the dataset.
-    if not os.path.exists(file_path):
-        setup_hdf5_file(file_path, dataset_name, data_array.shape)
+    Raises:
+        ValueError: If the dataset exists with a different shape than the data.
+    """
 
-    # Open the HDF5 file in read/write mode.
-    with h5py.File(file_path, 'r+') as file:
-        dataset = file[dataset_name]  # Open the specified dataset.
+    # Match the layout and data type of the dataset up front so h5py writes
+    # straight from the buffer instead of converting it internally.
+    data_array = np.ascontiguousarray(data_array, dtype=np.float32)
 
-        # Write the data to the dataset.
-        dataset[...] = data_array
+    if backend == 'zarr':
+        _write_data_and_label_zarr(
+            file_path,
+            dataset_name,
+            data_array,
+            label_array,
+        )
+        return
+    elif backend != 'h5':
+        raise ValueError(f"Unknown backend: {backend}")
+
+    # Checksum of the data as stored, used to skip rewriting unchanged data.
+    checksum = _checksum(data_array)
+
+    # Open the HDF5 file once, creating it if it does not exist.
+    with _open_file(file_path, 'a', cache_bytes, cache_slots,
+                    libver) as file:
+        if dataset_name not in file:
+            # Create the dataset with the data in place, which avoids writing
+            # the fill value before the data.
+            dataset = file.create_dataset(
+                dataset_name,
+                data=data_array,
+                **_dataset_kwargs(data_array.shape),
+            )
+            _write_checksum(dataset, checksum)
+        else:
+            dataset = file[dataset_name]  # Open the specified dataset.
+            if dataset.shape != data_array.shape:
+                raise ValueError(
+                    f"Data of shape {data_array.shape} does not match dataset "
+                    f"'{dataset_name}' of shape {dataset.shape}.")
+
+            # Skip the write if the dataset already holds the same data.
+            unchanged = (checksum is not None and
+                         dataset.attrs.get('xxh64') == checksum)
+            if not unchanged:
+                # Write the data to the dataset.
+                dataset[...] = data_array
+                _write_checksum(dataset, checksum)
 
         # Add the label as an attribute to the dataset.
-        dataset.attrs['label'] = label_array
+        _write_label(dataset, 'label', label_array)
+
+
+def _checksum(data_array: np.ndarray) -> Optional[int]:
+    """Computes the xxHash checksum of data as stored in a float32 dataset.
+
+    Args:
+        data_array (np.ndarray): The data to checksum, already converted to a
+            C-contiguous float32 array.
+
+    Returns:
+        Optional[int]: The 64-bit checksum, or None if the optional `xxhash`
+            package is not installed.
+    """
+    if xxhash is None:
+        return None
+    return xxhash.xxh3_64_intdigest(data_array)
+
+
+def _write_checksum(dataset: h5py.Dataset, checksum: Optional[int]) -> None:
+    """Records the checksum of newly written data in the dataset.
+
+    Args:
+        dataset (h5py.Dataset): The dataset the data was written to.
+        checksum (Optional[int]): The checksum of the data, or None to drop a
+            stale checksum when it cannot be computed.
+
+    Returns:
+        None
+    """
+    if checksum is not None:
+        dataset.attrs['xxh64'] = np.uint64(checksum)
+    elif 'xxh64' in dataset.attrs:
+        del dataset.attrs['xxh64']
+
+
+def _write_data_and_label_zarr(
+    file_path: str,
+    dataset_name: str,
+    data_array: np.ndarray,
+    label_array: np.ndarray,
+) -> None:
+    """Writes data and label to an array in a Zarr store.
+
+    Args:
+        file_path (str): The path to the Zarr store.
+        dataset_name (str): The name of the array in the Zarr store.
+        data_array (np.ndarray): The data to be written to the array.
+        label_array (np.ndarray): The label to be added as an attribute to the
+            array.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If the array exists with a different shape than the data.
+    """
+    import zarr
+
+    # Open the array, creating it if it does not exist, with its chunks
+    # compressed by Blosc using zstd on bit-shuffled data.
+    array = zarr.open_array(
+        file_path,
+        path=dataset_name,
+        mode='a',
+        shape=data_array.shape,
+        chunks=_pick_chunks(data_array.shape, np.float32),
+        dtype=np.float32,
+        codecs=[
+            zarr.codecs.BytesCodec(),
+            zarr.codecs.BloscCodec(
+                cname='zstd',
+                clevel=3,
+                shuffle='bitshuffle',
+            ),
+        ],
+    )
+    if array.shape != data_array.shape:
+        raise ValueError(
+            f"Data of shape {data_array.shape} does not match array "
+            f"'{dataset_name}' of shape {array.shape}.")
+
+    # Write the data to the array.
+    array[...] = data_array
+
+    # Zarr attributes are stored as JSON, so byte string labels are decoded.
+    labels = [
+        label.decode('utf-8') if isinstance(label, bytes) else label
+        for label in np.asarray(label_array).ravel().tolist()
+    ]
+    array.attrs['label'] = labels[0] if len(labels) == 1 else labels
 
 
 def setup_hdf5_file(
     file_path: str,
     dataset_name: str,
     shape: Tuple[int, ...],
+    cache_bytes: int = 64 << 20,
+    cache_slots: int = 100003,
+    fs_page_size: Optional[int] = None,
+    libver: str = 'latest',
 ) -> None:
     """
     Sets up an HDF5 file with a specified dataset.
 
+    The dataset is created with its full extent up front and can be filled
+    sample by sample with `write_sample`. The sample axis is unlimited so the
+    dataset can still grow if more samples arrive than expected.
+
     Args:
         file_path (str): The path to the HDF5 file.
         dataset_name (str): The name of the dataset to create.
         shape (Tuple[int, ...]): The shape of the dataset to create.
+        cache_bytes (int, optional): The size of the raw data chunk cache in
+            bytes. Defaults to 64 MB.
+        cache_slots (int, optional): The number of slots in the raw data chunk
+            cache hash table. Defaults to 100003.
+        fs_page_size (Optional[int], optional): The file space page size in
+            bytes of a newly created file. Files are created with the 'page'
+            file space strategy so that readers, e.g., on object stores, can
+            fetch a chunk with a single request. Defaults to the larger of 1
+            MB and the chunk size plus 4 KB of metadata.
+        libver (str, optional): The HDF5 file format version bounds passed to
+            `h5py.File`. See `write_data_and_label`. Defaults to 'latest'.
 
     Returns:
         None
     """
 
-    with h5py.File(file_path, 'a') as file:
-        file.require_dataset(
-            dataset_name,
-            shape=shape,
-            chunks=(
-                1,
-                *shape[1:],
-            ),  # Chunking with chunk size based on the shape.
-            dtype=np.float32,  # Set the data type of the dataset.
+    if fs_page_size is None:
+        chunk_bytes = (int(np.prod(_pick_chunks(shape, np.float32))) *
+                       np.dtype(np.float32).itemsize)
+        fs_page_size = max(1 << 20, chunk_bytes + 4096)
+
+    # The file space strategy can only be set when the file is created.
+    try:
+        file = _open_file(
+            file_path,
+            'x',
+            cache_bytes,
+            cache_slots,
+            libver,
+            fs_strategy='page',
+            fs_page_size=fs_page_size,
+            track_order=False,
         )
+    except FileExistsError:
+        file = _open_file(file_path, 'r+', cache_bytes, cache_slots, libver)
+
+    with file:
+        _require_dataset(file, dataset_name, shape)
+
+
+def _open_file(
+    file_path: str,
+    mode: str,
+    cache_bytes: int,
+    cache_slots: int,
+    libver: str,
+    **kwargs,
+) -> h5py.File:
+    """Opens an HDF5 file with a sized raw data chunk cache.
+
+    Args:
+        file_path (str): The path to the HDF5 file.
+        mode (str): The mode to open the file with.
+        cache_bytes (int): The size of the raw data chunk cache in bytes.
+        cache_slots (int): The number of slots in the raw data chunk cache hash
+            table.
+        libver (str): The HDF5 file format version bounds.
+        **kwargs: Additional keyword arguments passed to `h5py.File`.
+
+    Returns:
+        h5py.File: The opened HDF5 file.
+    """
+    return h5py.File(
+        file_path,
+        mode,
+        libver=libver,
+        rdcc_nbytes=cache_bytes,
+        rdcc_nslots=cache_slots,
+        rdcc_w0=0.75,
+        **kwargs,
+    )
+
+
+def _require_dataset(
+    file: h5py.File,
+    dataset_name: str,
+    shape: Tuple[int, ...],
+    dtype: np.dtype = np.float32,
+    chunks: Optional[Tuple[int, ...]] = None,
+) -> h5py.Dataset:
+    """Opens a dataset, creating it with an unlimited sample axis if needed.
+
+    Args:
+        file (h5py.File): The opened HDF5 file.
+        dataset_name (str): The name of the dataset.
+        shape (Tuple[int, ...]): The shape of the dataset.
+        dtype (np.dtype, optional): The data type of the dataset. Defaults to
+            np.float32.
+        chunks (Optional[Tuple[int, ...]], optional): The chunk shape. Defaults
+            to the one picked by `_pick_chunks`.
+
+    Returns:
+        h5py.Dataset: The dataset.
+    """
+    return file.require_dataset(
+        dataset_name,
+        shape=shape,
+        **_dataset_kwargs(shape, dtype=dtype, chunks=chunks),
+    )
+
+
+def _dataset_kwargs(
+    shape: Tuple[int, ...],
+    dtype: np.dtype = np.float32,
+    chunks: Optional[Tuple[int, ...]] = None,
+) -> dict:
+    """Keyword arguments shared by every dataset created in this module.
+
+    Args:
+        shape (Tuple[int, ...]): The shape of the dataset.
+        dtype (np.dtype, optional): The data type of the dataset. Defaults to
+            np.float32.
+        chunks (Optional[Tuple[int, ...]], optional): The chunk shape. Defaults
+            to the one picked by `_pick_chunks`.
+
+    Returns:
+        dict: The keyword arguments for `h5py.Group.create_dataset`.
+    """
+    return dict(
+        # One sample per chunk, split spatially to fit the chunk cache.
+        chunks=chunks or _pick_chunks(shape, dtype),
+        # Unlimited sample axis so that more samples can be added later.
+        maxshape=(None, *shape[1:]),
+        compression='lzf',  # Fast compression shipped with h5py.
+        shuffle=True,  # Byte shuffle to improve compression.
+        fletcher32=False,
+        fillvalue=0,
+        track_times=False,  # Skip updating timestamps in the metadata.
+        dtype=dtype,  # Set the data type of the dataset.
+    )
+
+
+def write_sample(
+    file: h5py.File,
+    dataset_name: str,
+    index: int,
+    data_array: np.ndarray,
+    label_array: np.ndarray,
+) -> None:
+    """
+    Writes a single sample and its label to a pre-sized dataset.
+
+    Unlike `write_data_and_label`, this function takes an already opened file
+    so that many samples can be written without reopening the file. The
+    dataset is expected to be created beforehand, e.g., with
+    `setup_hdf5_file`, and is only resized if `index` is past its end.
+
+    Args:
+        file (h5py.File): The opened HDF5 file.
+        dataset_name (str): The name of the dataset in the HDF5 file.
+        index (int): The index of the sample along the first axis.
+        data_array (np.ndarray): The sample to be written, without the sample
+            axis.
+        label_array (np.ndarray): The label to be added as the attribute
+            `label_{index}` to the dataset.
+
+    Returns:
+        None
+    """
+
+    dataset = file[dataset_name]  # Open the specified dataset.
+    _write_sample(dataset, index, data_array, label_array)
+
+
+def _write_sample(
+    dataset: h5py.Dataset,
+    index: int,
+    data_array: np.ndarray,
+    label_array: np.ndarray,
+) -> None:
+    """Writes a single sample and its label to an opened dataset.
+
+    Args:
+        dataset (h5py.Dataset): The dataset to write to.
+        index (int): The index of the sample along the first axis.
+        data_array (np.ndarray): The sample to be written.
+        label_array (np.ndarray): The label of the sample.
+
+    Returns:
+        None
+    """
+    # Grow the dataset along the sample axis if needed.
+    if index >= dataset.shape[0]:
+        dataset.resize(index + 1, axis=0)
+
+    # Write the sample to its slice of the dataset.
+    dataset[index] = data_array
+
+    # The checksum of the whole dataset no longer matches its data.
+    if 'xxh64' in dataset.attrs:
+        del dataset.attrs['xxh64']
+
+    # Add the label as an attribute to the dataset.
+    _write_label(dataset, f'label_{index}', label_array)
+
+
+class H5Writer:
+    """Context manager for writing many samples to a single HDF5 dataset.
+
+    The file is opened once on entering the context and closed on exit, so
+    writing N samples does not pay for N file opens, and the raw data chunk
+    cache is kept across writes. Samples are written from index `start`
+    onwards each time the context is entered, overwriting any existing
+    samples and labels at those indices.
+
+    Example:
+        >>> with H5Writer(file_path, 'images', (10, 3, 256, 256)) as writer:
+        ...     for data, label in samples:
+        ...         writer.add(data, label)
+
+    Args:
+        file_path (str): The path to the HDF5 file.
+        dataset_name (str): The name of the dataset in the HDF5 file.
+        shape (Tuple[int, ...]): The expected shape of the dataset. The sample
+            axis grows if more samples are added.
+        dtype (np.dtype, optional): The data type of the dataset. Defaults to
+            np.float32.
+        chunks (Optional[Tuple[int, ...]], optional): The chunk shape. Defaults
+            to the one picked by `_pick_chunks`.
+        start (int, optional): The index of the first sample to write, e.g.,
+            the number of samples already in the dataset to append to it.
+            Defaults to 0.
+        cache_bytes (int, optional): The size of the raw data chunk cache in
+            bytes. Defaults to 64 MB.
+        cache_slots (int, optional): The number of slots in the raw data chunk
+            cache hash table. Defaults to 100003.
+        libver (str, optional): The HDF5 file format version bounds. 'latest'
+            enables dense attribute storage, which speeds up adding one label
+            attribute per sample. See `write_data_and_label`. Defaults to
+            'latest'.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        dataset_name: str,
+        shape: Tuple[int, ...],
+        dtype: np.dtype = np.float32,
+        chunks: Optional[Tuple[int, ...]] = None,
+        start: int = 0,
+        cache_bytes: int = 64 << 20,
+        cache_slots: int = 100003,
+        libver: str = 'latest',
+    ) -> None:
+        self.file_path = file_path
+        self.dataset_name = dataset_name
+        self.shape = shape
+        self.dtype = dtype
+        self.chunks = chunks
+        self.start = start
+        self.cache_bytes = cache_bytes
+        self.cache_slots = cache_slots
+        self.libver = libver
+
+        self.file = None
+        self.dataset = None
+        self.index = start
+
+    def __enter__(self) -> 'H5Writer':
+        self.file = _open_file(
+            self.file_path,
+            'a',
+            self.cache_bytes,
+            self.cache_slots,
+            self.libver,
+        )
+        try:
+            self.dataset = _require_dataset(
+                self.file,
+                self.dataset_name,
+                self.shape,
+                dtype=self.dtype,
+                chunks=self.chunks,
+            )
+        except Exception:
+            # Do not leak the file if the dataset does not match.
+            self.file.close()
+            self.file = None
+            raise
+        self.index = self.start
+        return self
+
+    def add(self, data_array: np.ndarray, label_array: np.ndarray) -> None:
+        """Writes the next sample and its label to the dataset.
+
+        Args:
+            data_array (np.ndarray): The sample to be written, without the
+                sample axis.
+            label_array (np.ndarray): The label to be added as the attribute
+                `label_{index}` to the dataset.
+
+        Returns:
+            None
+        """
+        _write_sample(self.dataset, self.index, data_array, label_array)
+        self.index += 1
+
+    def __exit__(self, *args) -> None:
+        self.file.flush()
+        self.file.close()
+        self.file = None
+        self.dataset = None
+
+
+def write_many(
+    file_path: str,
+    dataset_name: str,
+    data_arrays: Sequence[np.ndarray],
+    label_arrays: Sequence[np.ndarray],
+    max_workers: int = 4,
+    cache_bytes: int = 64 << 20,
+    cache_slots: int = 100003,
+    libver: str = 'latest',
+) -> None:
+    """
+    Writes many samples and their labels to an HDF5 file using threads.
+
+    The file is opened once and the dataset is created with its full extent
+    up front, or resized to the number of samples if it already exists. Each
+    sample is then written to its own slice of the dataset by a pool of
+    threads. Since chunks never span more than one sample, no two threads
+    write to the same chunk. Note that h5py serializes calls into the HDF5
+    library, so the threads mainly overlap the conversion of each sample to a
+    contiguous float32 buffer with the writes of other samples.
+
+    Args:
+        file_path (str): The path to the HDF5 file.
+        dataset_name (str): The name of the dataset in the HDF5 file.
+        data_arrays (Sequence[np.ndarray]): The samples to be written, each
+            without the sample axis and all with the same shape.
+        label_arrays (Sequence[np.ndarray]): The label of each sample, added
+            as the attribute `label_{index}` to the dataset.
+        max_workers (int, optional): The number of threads. Defaults to 4.
+        cache_bytes (int, optional): The size of the raw data chunk cache in
+            bytes. Defaults to 64 MB.
+        cache_slots (int, optional): The number of slots in the raw data chunk
+            cache hash table. Defaults to 100003.
+        libver (str, optional): The HDF5 file format version bounds. See
+            `write_data_and_label`. Defaults to 'latest'.
+
+    Returns:
+        None
+    """
+
+    if len(data_arrays) != len(label_arrays):
+        raise ValueError("The number of samples and labels must match.")
+
+    # Nothing to write, and no sample to infer the shape of the dataset from.
+    if len(data_arrays) == 0:
+        return
+
+    shape = (len(data_arrays), *np.shape(data_arrays[0]))
+
+    with _open_file(file_path, 'a', cache_bytes, cache_slots,
+                    libver) as file:
+        dataset = _require_dataset(file, dataset_name, shape)
+
+        # An existing dataset may hold a different number of samples. Match it
+        # to the input before the threads start, since resizing from the
+        # threads would race, and drop the labels of removed samples.
+        num_samples = dataset.shape[0]
+        if num_samples != len(data_arrays):
+            dataset.resize(len(data_arrays), axis=0)
+            for index in range(len(data_arrays), num_samples):
+                if f'label_{index}' in dataset.attrs:
+                    del dataset.attrs[f'label_{index}']
+
+        # The checksum of the whole dataset no longer matches its data.
+        if 'xxh64' in dataset.attrs:
+            del dataset.attrs['xxh64']
+
+        def _write(index: int) -> None:
+            dataset[index] = np.ascontiguousarray(data_arrays[index],
+                                                  dtype=dataset.dtype)
+            _write_label(dataset, f'label_{index}', label_arrays[index])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results to re-raise any exception from the threads.
+            list(executor.map(_write, range(len(data_arrays))))
+
+
+def _write_label(
+    dataset: h5py.Dataset,
+    attr_name: str,
+    label_array: np.ndarray,
+) -> None:
+    """Writes a label as an attribute of a dataset.
+
+    A single label is stored as a scalar attribute. String labels are stored
+    as fixed-length strings as wide as the longest label, and other labels,
+    e.g., class indices, with their own data type.
+
+    Args:
+        dataset (h5py.Dataset): The dataset to add the attribute to.
+        attr_name (str): The name of the attribute.
+        label_array (np.ndarray): The label(s) to be written.
+
+    Returns:
+        None
+    """
+    label_array = np.asarray(label_array)
+
+    if label_array.dtype.kind not in 'SU':
+        if label_array.size == 1:
+            label_array = label_array.reshape(())
+        dataset.attrs[attr_name] = label_array
+    elif label_array.size == 1:
+        label = label_array.item()
+        if isinstance(label, str):
+            label = label.encode('utf-8')
+        dataset.attrs.create(attr_name,
+                             data=label,
+                             dtype=f'S{max(len(label), 1)}')
+    else:
+        width = max((len(label) for label in label_array.flat), default=1)
+        dataset.attrs.create(attr_name,
+                             data=label_array.astype(f'S{max(width, 1)}'))
+
+
+def _pick_chunks(
+    shape: Tuple[int, ...],
+    dtype: np.dtype,
+    target_bytes: int = 1 << 20,
+) -> Tuple[int, ...]:
+    """Picks a chunk shape no larger than `target_bytes`.
+
+    Starts from a single sample per chunk, i.e., `(1, *shape[1:])`, and halves
+    the largest non-sample axis until the chunk fits within `target_bytes`.
+    The default of 1 MB matches the default size of the HDF5 raw data chunk
+    cache, so that a whole chunk can be cached on read-back.
+
+    Args:
+        shape (Tuple[int, ...]): The shape of the dataset.
+        dtype (np.dtype): The data type of the dataset.
+        target_bytes (int, optional): The maximum size of a chunk in bytes.
+            Defaults to 1 MB.
+
+    Returns:
+        Tuple[int, ...]: The chunk shape.
+    """
+    chunks = [1, *shape[1:]]
+    itemsize = np.dtype(dtype).itemsize
+
+    while len(chunks) > 1 and np.prod(chunks) * itemsize > target_bytes:
+        # Halve the largest axis, excluding the sample axis.
+        axis = 1 + int(np.argmax(chunks[1:]))
+        if chunks[axis] == 1:
+            break
+        chunks[axis] = (chunks[axis] + 1) // 2
+
+    return tuple(int(c) for c in chunks)
+
+
+def _chunk_stats(dataset: h5py.Dataset) -> Tuple[int, int]:
+    """Counts the stored chunks of a dataset and their total size.
+
+    Uses `DatasetID.chunk_iter`, which visits all chunks in a single call, and
+    falls back to querying chunks one at a time with `get_chunk_info` when
+    the HDF5 library is older than 1.12.3. The totals are accumulated while
+    visiting the chunks, so no per-chunk information is kept in memory.
+
+    Args:
+        dataset (h5py.Dataset): The dataset whose chunks to count.
+
+    Returns:
+        Tuple[int, int]: The number of stored chunks and their total size in
+            bytes. Both are zero for datasets that are not chunked.
+    """
+    if dataset.chunks is None:
+        return 0, 0
+
+    # The number of chunks and their total size, updated by the callback.
+    stats = [0, 0]
+
+    def _add_chunk(chunk: h5py.h5d.StoreInfo) -> None:
+        stats[0] += 1
+        stats[1] += chunk.size
+
+    if hasattr(dataset.id, 'chunk_iter'):
+        dataset.id.chunk_iter(_add_chunk)
+    else:
+        for i in range(dataset.id.get_num_chunks()):
+            _add_chunk(dataset.id.get_chunk_info(i))
+
+    return stats[0], stats[1]
 
 
 def print_hdf5_structure(group: h5py.Group, indent: int = 2) -> None:
-    """Recursively prints the structure of an HDF5 file.
+    """Prints the structure of an HDF5 file.
+
+    The whole structure is formatted first and written to stdout at once.
 
     Args:
         group (h5py.Group): The HDF5 group to print.
-        indent (int, optional): The number of spaces for indentation. Defaults
-            to 2.
+        indent (int, optional): The number of spaces for indentation per
+            level. Defaults to 2.
 
     Returns:
         None
     """
 
-    print("HDF5 File Structure:")
+    lines = _format_hdf5_structure(group, indent=indent)
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def _format_hdf5_structure(group: h5py.Group, indent: int = 2) -> List[str]:
+    """Formats the structure of an HDF5 file as lines of text.
+
+    The tree is traversed with `h5py.Group.visititems`, which walks the file
+    in HDF5 rather than recursing in Python.
+
+    Args:
+        group (h5py.Group): The HDF5 group to format.
+        indent (int, optional): The number of spaces for indentation per
+            level. Defaults to 2.
+
+    Returns:
+        List[str]: The lines describing the structure, without newlines.
+    """
+
+    lines = ["HDF5 File Structure:"]
+
+    def _format_item(name: str, item: h5py.HLObject) -> None:
+        # Indent according to the depth of the item in the tree.
+        depth = name.count('/') + 1
+        pad = " " * (indent * depth)
+        base_name = name.rsplit('/', 1)[-1]
 
-    # Iterate through each item in the current HDF5 group.
-    for name, item in group.items():
         # Check if the item is a group.
         if isinstance(item, h5py.Group):
-            # Print the group name with indentation.
-            print(" " * indent + f"group: {name}/")
-            # Recursively print the structure of the subgroup.
-            print_hdf5_structure(item, indent + 2)
+            # Add the group name with indentation.
+            lines.append(f"{pad}group: {base_name}/")
 
         # Check if the item is a dataset
         elif isinstance(item, h5py.Dataset):
-            # Print the dataset name, shape, and data type with indentation.
-            print(" " * indent + "dataset:")
-            print(" " * (indent + 4) + f"{name} (shape: {item.shape}, "
-                  f"dtype: {item.dtype})")
-
-            # If the dataset has attributes, print their names and shapes.
+            # Add the dataset name, shape, and data type with indentation.
+            lines.append(f"{pad}dataset:")
+            lines.append(f"{pad}    {base_name} (shape: {item.shape}, "
+                         f"dtype: {item.dtype})")
+
+            # Add the chunk shape and the number and size of stored chunks.
+            if item.chunks is not None:
+                num_chunks, num_bytes = _chunk_stats(item)
+                lines.append(f"{pad}    chunks: {item.chunks} ({num_chunks} "
+                             f"stored, {num_bytes} bytes)")
+
+            # If the dataset has attributes, add their names and shapes.
             if len(item.attrs.keys()) > 0:
-                print(" " * (indent) + "attributes:")
+                lines.append(f"{pad}attributes:")
                 for attr_name, attr_value in item.attrs.items():
-                    # Print the attribute name and shape with additional
+                    # Add the attribute name and shape with additional
                     # indentation.
-                    print(" " * (indent + 4) +
-                          f"{attr_name}: (shape={attr_value.shape},"
-                          f" dtype={attr_value.dtype})")
+                    lines.append(f"{pad}    {attr_name}: "
+                                 f"(shape={attr_value.shape}, "
+                                 f"dtype={attr_value.dtype})")
 
-                    # Print the attribute values if they are small.
+                    # Add the attribute values if they are small.
                     if attr_value.size < 10:
-                        print(
-                            " " * (indent + 4) + f"values: "
-                            f"{[label.decode('utf-8') for label in attr_value]}"
-                        )
+                        values = [
+                            value.decode('utf-8')
+                            if isinstance(value, bytes) else value
+                            for value in np.atleast_1d(attr_value).tolist()
+                        ]
+                        lines.append(f"{pad}    values: {values}")
+
+    # Visit every group and dataset below the current group.
+    group.visititems(_format_item)
+
+    return lines
 
 
 def main() -> None:
@@ -1,12 +1,10 @@
 """Utility functions that provide the absolute path to project directories.
 """
 
+import functools
 import os
 from typing import Optional
 
-import git
-from git.exc import InvalidGitRepositoryError, NoSuchPathError
-
 
 def find_project_root(marker='setup.cfg') -> str:
     """Find the absolute path to the project's root directory.
@@ -18,9 +16,15 @@ def find_project_root(marker='setup.cfg') -> str:
     Returns:
         str: The absolute path to the project's root directory.
     """
-    current_dir = os.getcwd()
+    return _find_project_root(os.getcwd(), marker)
+
+
+@functools.lru_cache(maxsize=8)
+def _find_project_root(current_dir: str, marker: str) -> str:
+    """Cached parent directory walk for `find_project_root`.
+    """
     while current_dir != os.path.dirname(current_dir):
-        if marker in os.listdir(current_dir):
+        if os.path.exists(os.path.join(current_dir, marker)):
             return current_dir
         current_dir = os.path.dirname(current_dir)
     raise FileNotFoundError(
@@ -30,13 +34,24 @@ def find_project_root(marker='setup.cfg') -> str:
 
 def gitdir() -> str:
     """Find the absolute path to the GitHub repository root.
+
+    The result is cached per working directory.
     """
-    try:
-        git_repo = git.Repo(os.getcwd(), search_parent_directories=True)
-        git_root = git_repo.git.rev_parse('--show-toplevel')
-        return git_root
-    except (InvalidGitRepositoryError, NoSuchPathError):
-        return find_project_root()
+    return _gitdir(os.getcwd())
+
+
+@functools.lru_cache(maxsize=8)
+def _gitdir(current_dir: str) -> str:
+    """Cached repository root lookup for `gitdir`.
+    """
+    start_dir = current_dir
+    # A `.git` entry is a directory in a regular checkout and a file in
+    # worktrees and submodules.
+    while current_dir != os.path.dirname(current_dir):
+        if os.path.exists(os.path.join(current_dir, '.git')):
+            return current_dir
+        current_dir = os.path.dirname(current_dir)
+    return _find_project_root(start_dir, 'setup.cfg')
 
 
 def datadir(path: str, mkdir: Optional[bool] = True) -> str:
@@ -51,8 +66,8 @@ def datadir(path: str, mkdir: Optional[bool] = True) -> str:
             does not exist.
     """
     path = os.path.join(gitdir(), 'data/', path)
-    if (not os.path.exists(path)) and mkdir:
-        os.makedirs(path)
+    if mkdir:
+        os.makedirs(path, exist_ok=True)
     return path
 
 
@@ -68,6 +83,6 @@ def plotsdir(path: str, mkdir: Optional[bool] = True) -> str:
             does not exist.
     """
     path = os.path.join(gitdir(), 'plots/', path)
-    if (not os.path.exists(path)) and mkdir:
-        os.makedirs(path)
+    if mkdir:
+        os.makedirs(path, exist_ok=True)
     return path